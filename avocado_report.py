@@ -7,8 +7,9 @@ key performance metrics by parsing per-test debug.log files.
 
 This version improves:
 - stdlog prefix stripping (handles continuation lines like "[stdlog]   ...")
-- embedded JSON extraction for "Benchmark results:", "Filesystem test results:",
-  "Application test results:"
+- embedded JSON extraction for "Benchmark results:", "Datacenter test results:",
+  "Filesystem test results:", "Application test results:" (compact single-line
+  or pretty-printed blocks); fio JSON files referenced as "fio_json" are loaded
 - fio JSON parsing (collect full JSON object even if first line is just "{")
 - kernel fio "✓ Pass N: ..." summary parsing (works with stdlog prefixes)
 """
@@ -90,8 +91,14 @@ _RE_MIXED = re.compile(
     re.IGNORECASE,
 )
 
-# SQLite: "✓ SQLite insert rate: 357858.31 rows/s, select: 65.97 ops/s"
+# SQLite: "✓ SQLite insert rate: 357858 rows/s, point select: 24.8 us, scan: 710898983 rows/s"
 _RE_SQLITE = re.compile(
+    r"✓\s*SQLite\s*insert\s*rate:\s*([0-9]*\.?[0-9]+)\s*rows/s,\s*point\s*select:\s*([0-9]*\.?[0-9]+)\s*us,"
+    r"\s*scan:\s*([0-9]*\.?[0-9]+)\s*rows/s",
+    re.IGNORECASE,
+)
+# Older suites: "✓ SQLite insert rate: 357858.31 rows/s, select: 65.97 ops/s"
+_RE_SQLITE_LEGACY = re.compile(
     r"✓\s*SQLite\s*insert\s*rate:\s*([0-9]*\.?[0-9]+)\s*rows/s,\s*select:\s*([0-9]*\.?[0-9]+)\s*ops/s",
     re.IGNORECASE,
 )
@@ -210,10 +217,35 @@ def _fio_metrics_from_json(obj: Dict[str, Any]) -> Dict[str, float]:
     return res
 
 
+def _fio_metrics_from_file(path: Any) -> Dict[str, float]:
+    """
+    fio metrics from a JSON output file referenced in a results block ("fio_json").
+    Stonewalled multi-job runs (e.g. the QD sweep) are reduced to their last
+    reporting group, matching what the last fio run on stdout used to give.
+    """
+    if not isinstance(path, str) or not path:
+        return {}
+    p = Path(path)
+    if not p.exists():
+        return {}
+    try:
+        obj = json.loads(read_text_safe(p) or "{}")
+    except Exception:
+        return {}
+    jobs = obj.get("jobs")
+    if not isinstance(jobs, list):
+        return {}
+    jobs = [j for j in jobs if isinstance(j, dict)]
+    if jobs:
+        last_group = jobs[-1].get("groupid")
+        jobs = [j for j in jobs if j.get("groupid") == last_group]
+    return _fio_metrics_from_json({"jobs": jobs})
+
+
 def _extract_embedded_json_block(text: str, marker: str) -> Optional[Dict[str, Any]]:
     """
-    Extract a pretty-printed JSON object that follows a line containing `marker`,
-    where subsequent lines are prefixed with "[stdlog]".
+    Extract a JSON object that follows a line containing `marker`: either compact
+    on the marker line itself, or pretty-printed over subsequent "[stdlog]" lines.
     """
     lines = text.splitlines()
     for i, raw in enumerate(lines):
@@ -226,6 +258,13 @@ def _extract_embedded_json_block(text: str, marker: str) -> Optional[Dict[str, A
             pos = stripped.find(marker)
             tail = stripped[pos + len(marker):].strip()
             if tail:
+                # compact JSON: the whole object is on the marker line
+                try:
+                    obj, _ = json.JSONDecoder().raw_decode(tail)
+                    if isinstance(obj, dict):
+                        return obj
+                except ValueError:
+                    pass
                 payload_lines.append(tail)
             # consume following lines until we reach a closing "}" that balances, or blank line after JSON
             for j in range(i + 1, min(i + 300, len(lines))):
@@ -381,6 +420,12 @@ def parse_metrics_from_debuglog(test_name: str, debug_text: str) -> Dict[str, fl
     for raw in debug_text.splitlines():
         s = strip_stdlog(raw)
         mo = _RE_SQLITE.search(s)
+        if mo:
+            # tps = insert rows/s, eps = full-scan rows/s
+            m["tps"] = float(mo.group(1))
+            m["eps"] = float(mo.group(3))
+            continue
+        mo = _RE_SQLITE_LEGACY.search(s)
         if mo:
             m["tps"] = float(mo.group(1))
             m["eps"] = float(mo.group(2))
@@ -388,6 +433,7 @@ def parse_metrics_from_debuglog(test_name: str, debug_text: str) -> Dict[str, fl
     # 5) Embedded JSON blocks
     bench = _extract_embedded_json_block(debug_text, "Benchmark results:")
     if isinstance(bench, dict):
+        m.update(_fio_metrics_from_file(bench.get("fio_json")))
         lp = bench.get("latency_percentiles")
         if isinstance(lp, dict):
             # Prefer 50th_us / 99th_us
@@ -398,6 +444,11 @@ def parse_metrics_from_debuglog(test_name: str, debug_text: str) -> Dict[str, fl
             if isinstance(p99, (int, float)):
                 m["p99_us"] = float(p99)
 
+    dc = _extract_embedded_json_block(debug_text, "Datacenter test results:")
+    if isinstance(dc, dict):
+        m.update(_fio_metrics_from_file(dc.get("fio_json")))
+
+    # logged compactly by StorageFilesystemTests.tearDown; fio verify JSON is referenced by path
     fs = _extract_embedded_json_block(debug_text, "Filesystem test results:")
     if isinstance(fs, dict):
         fv = fs.get("fio_file_verify")